@@ -1,22 +1,81 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, session
+from flask import Flask, render_template, jsonify, request, redirect, url_for, session, Response, stream_with_context
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timezone
 from werkzeug.security import check_password_hash, generate_password_hash
 import secrets
 import os
 import sqlite3
 from functools import wraps
+from werkzeug.middleware.proxy_fix import ProxyFix
+import time
+import click
+import atexit
+import csv
+import hashlib
+import io
+from collections import deque, OrderedDict
+from utils.backup import run_backup, list_backups, rotate_backups, restore_backup
+from utils.feeds import (
+    build_entries, render_sitemap, render_rss, render_atom, write_feed_file, load_feed_file
+)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', secrets.token_hex(32))
 app.config['DATABASE'] = 'portfolio.db'
+app.config['EVENT_BUCKET_CAPACITY'] = 60
+app.config['EVENT_BUCKET_REFILL_RATE'] = 2.0
+app.config['EVENT_BATCH_MAX'] = 100
+app.config['ADDRESS_BUCKET_CAPACITY'] = 600
+app.config['ADDRESS_BUCKET_REFILL_RATE'] = 20.0
+app.config['PROXY_COUNT'] = int(os.getenv('PROXY_COUNT', 0))
+app.config['BACKUP_DIR'] = os.getenv('BACKUP_DIR', 'backups')
+app.config['BACKUP_PAGES_PER_STEP'] = 64
+app.config['BACKUP_STEP_PAUSE'] = 0.005
+app.config['BACKUP_COMPRESS'] = True
+app.config['BACKUP_RETENTION'] = 7
+app.config['BACKUP_INTERVAL_HOURS'] = float(os.getenv('BACKUP_INTERVAL_HOURS', 24))
+app.config['BACKUP_MIN_DELAY'] = 60
+app.config['CONTACT_FLUSH_INTERVAL'] = 1.0
+app.config['CONTACT_DEDUPE_WINDOW'] = 600
+app.config['CONTACT_DEDUPE_MAX'] = 1000
+app.config['CONTACT_MAX_LINKS'] = 3
+app.config['INBOX_PAGE_SIZE'] = 20
+# Public base URL (e.g. https://example.com) baked into the sitemap, feed links and entry ids.
+# Feeds are not generated until it is set.
+app.config['SITE_URL'] = os.getenv('SITE_URL', '').rstrip('/')
+app.config['SITE_TITLE'] = 'Vishal Kumar Portfolio'
+app.config['FEEDS_DIR'] = os.getenv('FEEDS_DIR', 'feeds')
+app.config['FEED_MAX_ITEMS'] = 50
 
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+# Number of proxies in front of the app (e.g. 1 on Heroku) so remote_addr is the real client.
+# Only then is the per-address analytics limit enabled.
+if app.config['PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_COUNT'])
+
 active_visitors = 0
 
+# Token buckets for analytics events: one per connection (keyed by socket sid), plus a looser
+# one per client address that outlives reconnects
+event_buckets = {}
+address_buckets = {}
+event_counts = {}
+TRACKED_EVENT_TYPES = {'page_view', 'click_event'}
+event_stats = {'accepted': 0, 'dropped': 0, 'sampledBatches': 0, 'batches': 0}
+
+last_backup = None
+
+# Contact submissions waiting for the next group commit
+contact_queue = deque()
+recent_submissions = OrderedDict()
+
+# Generated sitemap/feed bytes, served without touching the database
+feed_cache = {}
+feed_rebuild_pending = False
+
 # ==================== DATABASE ====================
 
 def get_db():
@@ -90,6 +149,14 @@ def init_db():
         )
     ''')
     
+    try:
+        cursor.execute('ALTER TABLE contact_messages ADD COLUMN is_read BOOLEAN DEFAULT 0')
+    except sqlite3.OperationalError:
+        pass
+    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_contact_messages_created_at ON contact_messages (created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_contact_messages_email ON contact_messages (email)')
+    
     try:
         cursor.execute('''
             INSERT INTO users (username, email, password, full_name, is_admin)
@@ -320,6 +387,64 @@ def admin_certifications():
 def admin_analytics():
     return render_template('admin/analytics.html')
 
+# ==================== CONTACT QUEUE ====================
+
+def submission_hash(email, message):
+    normalized = ' '.join(message.lower().split())
+    return hashlib.sha256(f"{email.lower()}\n{normalized}".encode()).hexdigest()
+
+def is_duplicate_submission(digest):
+    """Check and remember a submission hash, forgetting entries older than the window."""
+    now = time.monotonic()
+    window = app.config['CONTACT_DEDUPE_WINDOW']
+    
+    while recent_submissions:
+        seen_at = next(iter(recent_submissions.values()))
+        if now - seen_at < window and len(recent_submissions) < app.config['CONTACT_DEDUPE_MAX']:
+            break
+        recent_submissions.popitem(last=False)
+    
+    if digest in recent_submissions:
+        return True
+    recent_submissions[digest] = now
+    return False
+
+def looks_like_spam(message):
+    return message.lower().count('http') > app.config['CONTACT_MAX_LINKS']
+
+def flush_contact_queue():
+    """Write every queued contact message in a single transaction."""
+    batch = []
+    while contact_queue:
+        batch.append(contact_queue.popleft())
+    if not batch:
+        return 0
+    
+    conn = get_db()
+    try:
+        conn.executemany('''
+            INSERT INTO contact_messages (name, email, subject, message, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', batch)
+        conn.commit()
+    except sqlite3.Error as e:
+        contact_queue.extendleft(reversed(batch))
+        print(f"❌ Contact flush failed, {len(batch)} message(s) requeued: {str(e)}")
+        return 0
+    finally:
+        conn.close()
+    
+    print(f"📧 Saved {len(batch)} contact message(s)")
+    return len(batch)
+
+def contact_writer():
+    while True:
+        socketio.sleep(app.config['CONTACT_FLUSH_INTERVAL'])
+        flush_contact_queue()
+
+socketio.start_background_task(contact_writer)
+atexit.register(flush_contact_queue)
+
 # ==================== PUBLIC API ====================
 
 @app.route('/api/health')
@@ -397,15 +522,13 @@ def contact_form():
         if not all([name, email, message]):
             return jsonify({'success': False, 'message': 'All fields required'}), 400
         
-        conn = get_db()
-        conn.execute('''
-            INSERT INTO contact_messages (name, email, subject, message)
-            VALUES (?, ?, ?, ?)
-        ''', (name, email, subject, message))
-        conn.commit()
-        conn.close()
+        if looks_like_spam(message):
+            return jsonify({'success': False, 'message': 'Message looks like spam'}), 400
         
-        print(f"📧 Contact from: {name} ({email})")
+        if not is_duplicate_submission(submission_hash(email, message)):
+            created_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            contact_queue.append((name, email, subject, message, created_at))
+            print(f"📧 Contact from: {name} ({email})")
         
         return jsonify({
             'success': True,
@@ -459,6 +582,8 @@ def admin_projects_api():
         
         print(f"📁 New Project Added: {data.get('title')}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Project added successfully!'})
     
     if request.method == 'DELETE':
@@ -469,6 +594,8 @@ def admin_projects_api():
         
         print(f"🗑️ Project deleted: ID {project_id}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Project deleted successfully!'})
 
 @app.route('/api/admin/blogs', methods=['GET', 'POST', 'DELETE'])
@@ -506,6 +633,8 @@ def admin_blogs_api():
         
         print(f"📝 New Blog Posted: {data.get('title')}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Blog post published successfully!'})
     
     if request.method == 'DELETE':
@@ -516,6 +645,8 @@ def admin_blogs_api():
         
         print(f"🗑️ Blog deleted: ID {blog_id}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Blog post deleted successfully!'})
 
 @app.route('/api/admin/certifications', methods=['GET', 'POST', 'DELETE'])
@@ -555,6 +686,8 @@ def admin_certifications_api():
         
         print(f"🎓 New Certification Added: {data.get('title')}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Certification added successfully!'})
     
     if request.method == 'DELETE':
@@ -565,6 +698,8 @@ def admin_certifications_api():
         
         print(f"🗑️ Certification deleted: ID {cert_id}")
         
+        schedule_feed_rebuild()
+        
         return jsonify({'success': True, 'message': 'Certification deleted successfully!'})
 
 @app.route('/api/admin/stats')
@@ -577,6 +712,7 @@ def admin_stats():
     total_certs = conn.execute('SELECT COUNT(*) as count FROM certifications').fetchone()['count']
     total_users = conn.execute('SELECT COUNT(*) as count FROM users').fetchone()['count']
     total_messages = conn.execute('SELECT COUNT(*) as count FROM contact_messages').fetchone()['count']
+    unread_messages = conn.execute('SELECT COUNT(*) as count FROM contact_messages WHERE is_read = 0').fetchone()['count']
     
     conn.close()
     
@@ -588,10 +724,329 @@ def admin_stats():
             'totalCertifications': total_certs,
             'totalUsers': total_users,
             'totalMessages': total_messages,
-            'activeVisitors': active_visitors
+            'unreadMessages': unread_messages,
+            'queuedMessages': len(contact_queue),
+            'activeVisitors': active_visitors,
+            'events': dict(event_stats, byType=dict(event_counts))
         }
     })
 
+def message_to_dict(m):
+    return {
+        'id': m['id'],
+        'name': m['name'],
+        'email': m['email'],
+        'subject': m['subject'],
+        'message': m['message'],
+        'isRead': bool(m['is_read']),
+        'createdAt': m['created_at']
+    }
+
+@app.route('/api/admin/messages', methods=['GET', 'PATCH', 'DELETE'])
+@admin_required
+def admin_messages_api():
+    flush_contact_queue()
+    conn = get_db()
+    
+    if request.method == 'GET':
+        limit = max(1, min(request.args.get('limit', app.config['INBOX_PAGE_SIZE'], type=int), 100))
+        before_id = request.args.get('before_id', type=int)
+        before_created = request.args.get('before_created')
+        
+        if (before_id is None) != (not before_created):
+            conn.close()
+            return jsonify({'success': False, 'message': 'before_id and before_created must be given together'}), 400
+        
+        where, params = [], []
+        if before_id is not None:
+            where.append('(created_at, id) < (?, ?)')
+            params += [before_created, before_id]
+        if request.args.get('unread') == '1':
+            where.append('is_read = 0')
+        if request.args.get('email'):
+            where.append('email = ?')
+            params.append(request.args.get('email'))
+        
+        query = 'SELECT * FROM contact_messages'
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        
+        messages = conn.execute(query, params + [limit]).fetchall()
+        conn.close()
+        
+        next_cursor = None
+        if len(messages) == limit:
+            next_cursor = {'before_created': messages[-1]['created_at'], 'before_id': messages[-1]['id']}
+        
+        return jsonify({
+            'success': True,
+            'messages': [message_to_dict(m) for m in messages],
+            'next': next_cursor
+        })
+    
+    if request.method == 'PATCH':
+        data = request.get_json(silent=True)
+        ids = None
+        if isinstance(data, dict):
+            ids = data.get('ids') if 'ids' in data else [data.get('id')]
+        if not isinstance(ids, list) or not ids or not all(type(i) is int for i in ids):
+            conn.close()
+            return jsonify({'success': False, 'message': 'ids must be a list of message ids'}), 400
+        is_read = 1 if data.get('read', True) else 0
+        
+        conn.executemany('UPDATE contact_messages SET is_read = ? WHERE id = ?', [(is_read, i) for i in ids])
+        conn.commit()
+        conn.close()
+        
+        return jsonify({'success': True, 'message': 'Messages updated successfully!'})
+    
+    if request.method == 'DELETE':
+        message_id = request.args.get('id', type=int)
+        conn.execute('DELETE FROM contact_messages WHERE id = ?', (message_id,))
+        conn.commit()
+        conn.close()
+        
+        print(f"🗑️ Message deleted: ID {message_id}")
+        
+        return jsonify({'success': True, 'message': 'Message deleted successfully!'})
+
+def csv_safe(value):
+    """Stop spreadsheets from running public input as a formula."""
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+@app.route('/api/admin/messages/export')
+@admin_required
+def admin_messages_export():
+    flush_contact_queue()
+    
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['id', 'name', 'email', 'subject', 'message', 'is_read', 'created_at'])
+        
+        yield buffer.getvalue()
+        
+        # One short query per chunk, so no read stays open (and blocks writers) for the whole download
+        cursor_key = None
+        while True:
+            conn = get_db()
+            if cursor_key is None:
+                rows = conn.execute('''
+                    SELECT id, name, email, subject, message, is_read, created_at
+                    FROM contact_messages ORDER BY created_at DESC, id DESC LIMIT 500
+                ''').fetchall()
+            else:
+                rows = conn.execute('''
+                    SELECT id, name, email, subject, message, is_read, created_at
+                    FROM contact_messages WHERE (created_at, id) < (?, ?)
+                    ORDER BY created_at DESC, id DESC LIMIT 500
+                ''', cursor_key).fetchall()
+            conn.close()
+            if not rows:
+                break
+            
+            buffer.seek(0)
+            buffer.truncate(0)
+            writer.writerows([csv_safe(v) for v in r] for r in rows)
+            yield buffer.getvalue()
+            cursor_key = (rows[-1]['created_at'], rows[-1]['id'])
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=messages.csv'}
+    )
+
+# ==================== BACKUPS ====================
+
+def backup_database():
+    """Take an online snapshot without holding the database for the whole copy."""
+    global last_backup
+    result = run_backup(
+        app.config['DATABASE'],
+        app.config['BACKUP_DIR'],
+        pages=app.config['BACKUP_PAGES_PER_STEP'],
+        pause=lambda: socketio.sleep(app.config['BACKUP_STEP_PAUSE']),
+        compress=app.config['BACKUP_COMPRESS']
+    )
+    result['removed'] = rotate_backups(app.config['BACKUP_DIR'], app.config['BACKUP_RETENTION'])
+    last_backup = result
+    
+    print(f"💾 Backup {result['file']}: {result['pages']} pages in {result['duration']}s "
+          f"({result['pagesPerSecond']} pages/s)")
+    
+    return result
+
+def seconds_until_next_backup():
+    """Count from the newest backup on disk so worker restarts don't reset the schedule."""
+    interval = app.config['BACKUP_INTERVAL_HOURS'] * 3600
+    backups = list_backups(app.config['BACKUP_DIR'])
+    if not backups:
+        return 0
+    newest = os.path.getmtime(os.path.join(app.config['BACKUP_DIR'], backups[0]))
+    return max(0, newest + interval - time.time())
+
+def backup_scheduler():
+    while True:
+        # The floor gives a fresh worker time to settle and spaces out retries after a failure
+        socketio.sleep(max(app.config['BACKUP_MIN_DELAY'], seconds_until_next_backup()))
+        try:
+            backup_database()
+        except Exception as e:
+            print(f"❌ Scheduled backup failed: {str(e)}")
+
+if app.config['BACKUP_INTERVAL_HOURS'] > 0:
+    socketio.start_background_task(backup_scheduler)
+
+@app.route('/api/admin/backups', methods=['GET', 'POST'])
+@admin_required
+def admin_backups_api():
+    if request.method == 'POST':
+        try:
+            result = backup_database()
+        except Exception as e:
+            print(f"❌ Backup error: {str(e)}")
+            return jsonify({'success': False, 'message': 'Backup failed'}), 500
+        
+        return jsonify({'success': True, 'message': 'Backup created successfully!', 'backup': result})
+    
+    return jsonify({
+        'success': True,
+        'backups': list_backups(app.config['BACKUP_DIR']),
+        'lastBackup': last_backup
+    })
+
+@app.cli.command('backup-db')
+def backup_db_command():
+    """Create a database backup now."""
+    backup_database()
+
+@app.cli.command('restore-db')
+@click.argument('backup_file')
+def restore_db_command(backup_file):
+    """Restore the database from a backup file."""
+    path = backup_file
+    if not os.path.exists(path):
+        path = os.path.join(app.config['BACKUP_DIR'], backup_file)
+    if not os.path.exists(path):
+        raise click.ClickException(f'Backup not found: {backup_file}')
+    
+    try:
+        restore_backup(path, app.config['DATABASE'], pages=app.config['BACKUP_PAGES_PER_STEP'])
+    except (sqlite3.DatabaseError, OSError, EOFError) as e:
+        raise click.ClickException(f'Could not restore {os.path.basename(path)}: {e}')
+    print(f"♻️ Database restored from {os.path.basename(path)}")
+    build_feeds()
+
+# ==================== SITEMAP & FEEDS ====================
+
+def build_feeds():
+    """Regenerate sitemap.xml, feed.xml and feed.atom from the content tables."""
+    if not app.config['SITE_URL']:
+        print("⚠️ SITE_URL is not set, skipping sitemap and feed generation")
+        return []
+    
+    conn = get_db()
+    limit = app.config['FEED_MAX_ITEMS']
+    blogs = conn.execute('SELECT * FROM blogs ORDER BY published_at DESC').fetchall()
+    projects = conn.execute('SELECT * FROM projects ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
+    certs = conn.execute('SELECT * FROM certifications ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
+    conn.close()
+    
+    site_url = app.config['SITE_URL']
+    title = app.config['SITE_TITLE']
+    entries = build_entries(blogs[:limit], projects, certs, site_url)[:limit]
+    outputs = {
+        'sitemap.xml': render_sitemap(blogs, site_url),
+        'feed.xml': render_rss(entries, site_url, title),
+        'feed.atom': render_atom(entries, site_url, title)
+    }
+    
+    os.makedirs(app.config['FEEDS_DIR'], exist_ok=True)
+    changed = [name for name, body in outputs.items()
+               if write_feed_file(app.config['FEEDS_DIR'], name, body)]
+    for name in outputs:
+        feed_cache[name] = load_feed_file(app.config['FEEDS_DIR'], name)
+    
+    if changed:
+        print(f"🗺️ Feeds rebuilt: {', '.join(changed)}")
+    return changed
+
+def rebuild_feeds_task():
+    global feed_rebuild_pending
+    # Give a burst of admin edits a moment to land so they share one rebuild
+    socketio.sleep(1)
+    feed_rebuild_pending = False
+    try:
+        build_feeds()
+    except Exception as e:
+        print(f"❌ Feed rebuild failed: {str(e)}")
+
+def schedule_feed_rebuild():
+    global feed_rebuild_pending
+    if feed_rebuild_pending:
+        return
+    feed_rebuild_pending = True
+    socketio.start_background_task(rebuild_feeds_task)
+
+# Catch up with SITE_URL changes, re-seeded rows and edits made outside the admin API;
+# files whose content is unchanged are left alone. A failure only costs the feeds (served as 503).
+try:
+    build_feeds()
+except Exception as e:
+    print(f"❌ Feed build failed: {str(e)}")
+
+def current_feed(name):
+    """Cached feed bytes, reloaded when another process (e.g. flask restore-db) rewrote the file."""
+    cached = feed_cache.get(name)
+    if not app.config['SITE_URL']:
+        return None
+    
+    try:
+        mtime = os.path.getmtime(os.path.join(app.config['FEEDS_DIR'], name))
+    except OSError:
+        return cached
+    
+    if cached is None or cached['modified'] != datetime.fromtimestamp(mtime, timezone.utc):
+        try:
+            feed_cache[name] = cached = load_feed_file(app.config['FEEDS_DIR'], name)
+        except OSError:
+            pass
+    return cached
+
+def serve_feed(name):
+    cached = current_feed(name)
+    if cached is None:
+        return jsonify({'error': 'Feed not available'}), 503
+    
+    use_gzip = request.accept_encodings['gzip'] > 0
+    
+    response = Response(cached['gzip'] if use_gzip else cached['body'], mimetype=cached['mimetype'])
+    response.set_etag(cached['etag'] + ('-gz' if use_gzip else ''))
+    response.last_modified = cached['modified']
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    response.vary.add('Accept-Encoding')
+    if use_gzip:
+        response.content_encoding = 'gzip'
+    
+    return response.make_conditional(request)
+
+@app.route('/sitemap.xml')
+def sitemap():
+    return serve_feed('sitemap.xml')
+
+@app.route('/feed.xml')
+def rss_feed():
+    return serve_feed('feed.xml')
+
+@app.route('/feed.atom')
+def atom_feed():
+    return serve_feed('feed.atom')
+
 # ==================== SOCKETIO ====================
 
 @socketio.on('connect')
@@ -605,12 +1060,91 @@ def handle_connect():
 def handle_disconnect():
     global active_visitors
     active_visitors = max(0, active_visitors - 1)
+    event_buckets.pop(request.sid, None)
+    prune_address_buckets()
     print(f'❌ Visitor disconnected. Total: {active_visitors}')
     emit('visitor_count', {'count': active_visitors}, broadcast=True)
 
+def refilled_tokens(bucket, now):
+    elapsed = now - bucket['updated']
+    return min(bucket['capacity'], bucket['tokens'] + elapsed * bucket['rate'])
+
+def refill_bucket(buckets, key, capacity, rate, now):
+    bucket = buckets.setdefault(key, {'tokens': capacity, 'updated': now, 'capacity': capacity, 'rate': rate})
+    bucket['tokens'] = refilled_tokens(bucket, now)
+    bucket['updated'] = now
+    return bucket
+
+def prune_address_buckets():
+    """Forget address buckets that have refilled completely; a new one would start in the same state."""
+    now = time.monotonic()
+    for address in [a for a, b in address_buckets.items() if refilled_tokens(b, now) >= b['capacity']]:
+        del address_buckets[address]
+
+def take_event_tokens(wanted):
+    """Refill this connection's buckets and take up to `wanted` tokens from each."""
+    now = time.monotonic()
+    buckets = [refill_bucket(event_buckets, request.sid, app.config['EVENT_BUCKET_CAPACITY'],
+                             app.config['EVENT_BUCKET_REFILL_RATE'], now)]
+    if app.config['PROXY_COUNT']:
+        buckets.append(refill_bucket(address_buckets, request.remote_addr, app.config['ADDRESS_BUCKET_CAPACITY'],
+                                     app.config['ADDRESS_BUCKET_REFILL_RATE'], now))
+    
+    granted = min([wanted] + [int(b['tokens']) for b in buckets])
+    for bucket in buckets:
+        bucket['tokens'] -= granted
+    return granted
+
+def sample_events(events, keep):
+    """Keep `keep` evenly spaced events so a throttled batch still reflects the whole session."""
+    if keep >= len(events):
+        return events
+    if keep <= 0:
+        return []
+    step = len(events) / keep
+    return [events[int(i * step)] for i in range(keep)]
+
+def process_events(events):
+    if not isinstance(events, list):
+        return 0
+    
+    received = len(events)
+    events = [e for e in events[:app.config['EVENT_BATCH_MAX']] if isinstance(e, dict)]
+    granted = take_event_tokens(len(events))
+    kept = sample_events(events, granted)
+    
+    throttled = len(events) - len(kept)
+    event_stats['accepted'] += len(kept)
+    event_stats['dropped'] += received - len(kept)
+    if kept and throttled:
+        event_stats['sampledBatches'] += 1
+    
+    page_views = 0
+    for event in kept:
+        event_type = event.get('type')
+        if not isinstance(event_type, str) or event_type not in TRACKED_EVENT_TYPES:
+            event_type = 'other'
+        event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        if event_type == 'page_view':
+            page_views += 1
+    
+    if page_views:
+        print(f"📄 Page views: {page_views} (sid {request.sid[:8]})")
+    
+    return len(kept)
+
+@socketio.on('events_batch')
+def handle_events_batch(data):
+    if not isinstance(data, dict):
+        return
+    event_stats['batches'] += 1
+    process_events(data.get('events'))
+
 @socketio.on('page_view')
 def handle_page_view(data):
-    print(f"📄 Page view: {data.get('page')}")
+    if not isinstance(data, dict):
+        return
+    process_events([dict(data, type='page_view')])
 
 # ==================== ERROR HANDLERS ====================
 
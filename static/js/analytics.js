@@ -1 +1,46 @@
-console.log('analytics placeholder')
+// ==================== ANALYTICS BATCHING ====================
+// Events are queued locally and sent as a single `events_batch` message,
+// either on a timer, when the queue fills up, or when the tab is hidden.
+const PortfolioAnalytics = (() => {
+    const FLUSH_INTERVAL = 5000;
+    const MAX_QUEUE = 50;
+
+    let socket = null;
+    let queue = [];
+
+    function flush() {
+        if (!socket || !socket.connected || queue.length === 0) return;
+        socket.emit('events_batch', { events: queue });
+        queue = [];
+    }
+
+    function track(type, data = {}) {
+        queue.push({ ...data, type, timestamp: Date.now() });
+        if (queue.length >= MAX_QUEUE) flush();
+        // Still full means we're offline: keep only the newest events
+        if (queue.length > MAX_QUEUE) queue.splice(0, queue.length - MAX_QUEUE);
+    }
+
+    function init(sock) {
+        if (socket) return;
+        socket = sock;
+
+        track('page_view', { page: window.location.pathname });
+
+        document.addEventListener('click', (e) => {
+            track('click_event', {
+                x: e.clientX,
+                y: e.clientY,
+                element: e.target.tagName
+            });
+        });
+
+        socket.on('connect', flush);
+        setInterval(flush, FLUSH_INTERVAL);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') flush();
+        });
+    }
+
+    return { init, track, flush };
+})();
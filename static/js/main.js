@@ -77,21 +77,8 @@ document.querySelectorAll('a, button').forEach(element => {
 });
 
 // ==================== ANALYTICS TRACKING ====================
-// Track page views
-socket.emit('page_view', {
-    page: window.location.pathname,
-    timestamp: new Date()
-});
-
-// Track clicks
-document.addEventListener('click', (e) => {
-    socket.emit('click_event', {
-        x: e.clientX,
-        y: e.clientY,
-        element: e.target.tagName,
-        timestamp: new Date()
-    });
-});
+// Page views and clicks are batched by analytics.js
+PortfolioAnalytics.init(socket);
 
 // ==================== SMOOTH SCROLL ====================
 document.querySelectorAll('a[href^="#"]').forEach(anchor => {
@@ -0,0 +1,115 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+
+def run_backup(db_path, backup_dir, pages=64, pause=None, compress=True):
+    """Copy a live SQLite database with the online backup API.
+
+    The copy is done `pages` pages at a time. `pause` is called between
+    steps so the caller can yield to other green threads while the source
+    database stays readable and writable.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    name = 'portfolio-' + datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    target_path = os.path.join(backup_dir, name + ('.db.gz' if compress else '.db'))
+    # Work under .tmp names so a failed run never looks like a finished backup
+    copy_path = os.path.join(backup_dir, name + '.db.tmp')
+    gz_tmp_path = target_path + '.tmp'
+    progress_info = {'total': 0}
+
+    def progress(status, remaining, total):
+        progress_info['total'] = total
+        if pause:
+            pause()
+
+    started = time.monotonic()
+    try:
+        source = sqlite3.connect(db_path)
+        target = sqlite3.connect(copy_path)
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        finally:
+            target.close()
+            source.close()
+
+        if compress:
+            compress_file(copy_path, gz_tmp_path, pause=pause)
+            os.replace(gz_tmp_path, target_path)
+        else:
+            os.replace(copy_path, target_path)
+    except BaseException:
+        for path in (copy_path, gz_tmp_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    duration = time.monotonic() - started
+    total_pages = progress_info['total']
+    return {
+        'file': os.path.basename(target_path),
+        'size': os.path.getsize(target_path),
+        'pages': total_pages,
+        'duration': round(duration, 3),
+        'pagesPerSecond': round(total_pages / duration, 1) if duration else None,
+        'createdAt': datetime.now().isoformat()
+    }
+
+
+def compress_file(path, gz_path, chunk_size=1024 * 1024, pause=None):
+    """Gzip `path` into `gz_path` in chunks and remove the original."""
+    with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            dst.write(chunk)
+            if pause:
+                pause()
+    os.remove(path)
+
+
+def list_backups(backup_dir):
+    """Return backup files in `backup_dir`, newest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    files = [f for f in os.listdir(backup_dir)
+             if f.startswith('portfolio-') and (f.endswith('.db') or f.endswith('.db.gz'))]
+    return sorted(files, reverse=True)
+
+
+def rotate_backups(backup_dir, keep):
+    """Delete all but the newest `keep` backups and return the removed names."""
+    removed = list_backups(backup_dir)[keep:]
+    for name in removed:
+        os.remove(os.path.join(backup_dir, name))
+    return removed
+
+
+def restore_backup(backup_path, db_path, pages=64):
+    """Write a snapshot back into the live database through the backup API."""
+    snapshot_path = backup_path
+    try:
+        if backup_path.endswith('.gz'):
+            snapshot_path = backup_path[:-3] + '.restore'
+            with gzip.open(backup_path, 'rb') as src, open(snapshot_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+
+        source = sqlite3.connect(snapshot_path)
+        try:
+            check = source.execute('PRAGMA quick_check').fetchone()[0]
+            if check != 'ok':
+                raise sqlite3.DatabaseError(f'Snapshot failed integrity check: {check}')
+            target = sqlite3.connect(db_path)
+            try:
+                source.backup(target, pages=pages)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    finally:
+        if snapshot_path != backup_path and os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import quote, urlparse
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+STATIC_PAGES = ['/', '/about', '/projects', '/blog', '/certifications', '/contact']
+
+FEED_FILES = {
+    'sitemap.xml': 'application/xml',
+    'feed.xml': 'application/rss+xml',
+    'feed.atom': 'application/atom+xml'
+}
+
+
+def parse_timestamp(value):
+    """Parse SQLite's CURRENT_TIMESTAMP format (UTC) into an aware datetime."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return datetime.now(timezone.utc)
+
+
+def entry_id(site_url, kind, row_id, created):
+    """A tag: URI unique to one row, since several rows can share the same link."""
+    host = urlparse(site_url).hostname or 'localhost'
+    return f"tag:{host},{created.strftime('%Y-%m-%d')}:{kind}/{row_id}"
+
+
+def build_entries(blogs, projects, certifications, site_url):
+    """Turn table rows into feed entries, newest first."""
+    entries = []
+    for b in blogs:
+        updated = parse_timestamp(b['published_at'])
+        entries.append({
+            'id': entry_id(site_url, 'blog', b['id'], updated),
+            'title': b['title'],
+            'link': f"{site_url}/blog/{quote(b['slug'])}",
+            'summary': b['excerpt'],
+            'updated': updated
+        })
+    for p in projects:
+        updated = parse_timestamp(p['created_at'])
+        entries.append({
+            'id': entry_id(site_url, 'project', p['id'], updated),
+            'title': f"Project: {p['title']}",
+            'link': p['demo'] or p['github'] or f'{site_url}/projects',
+            'summary': p['description'],
+            'updated': updated
+        })
+    for c in certifications:
+        updated = parse_timestamp(c['created_at'])
+        entries.append({
+            'id': entry_id(site_url, 'certification', c['id'], updated),
+            'title': f"Certification: {c['title']} ({c['issuer']})",
+            'link': c['url'] or f'{site_url}/certifications',
+            'summary': f"{c['title']} issued by {c['issuer']} on {c['date']}",
+            'updated': updated
+        })
+    return sorted(entries, key=lambda e: e['updated'], reverse=True)
+
+
+def render_sitemap(blogs, site_url):
+    urlset = ET.Element('urlset', xmlns=SITEMAP_NS)
+    for page in STATIC_PAGES:
+        ET.SubElement(ET.SubElement(urlset, 'url'), 'loc').text = site_url + page
+    for b in blogs:
+        url = ET.SubElement(urlset, 'url')
+        ET.SubElement(url, 'loc').text = f"{site_url}/blog/{quote(b['slug'])}"
+        ET.SubElement(url, 'lastmod').text = parse_timestamp(b['published_at']).strftime('%Y-%m-%d')
+    return ET.tostring(urlset, encoding='utf-8', xml_declaration=True)
+
+
+def render_rss(entries, site_url, title):
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = title
+    ET.SubElement(channel, 'link').text = site_url + '/'
+    ET.SubElement(channel, 'description').text = f'Latest posts, projects and certifications from {title}'
+    if entries:
+        ET.SubElement(channel, 'lastBuildDate').text = format_datetime(entries[0]['updated'])
+    for e in entries:
+        item = ET.SubElement(channel, 'item')
+        ET.SubElement(item, 'title').text = e['title']
+        ET.SubElement(item, 'link').text = e['link']
+        ET.SubElement(item, 'guid', isPermaLink='false').text = e['id']
+        ET.SubElement(item, 'description').text = e['summary']
+        ET.SubElement(item, 'pubDate').text = format_datetime(e['updated'])
+    return ET.tostring(rss, encoding='utf-8', xml_declaration=True)
+
+
+def render_atom(entries, site_url, title):
+    feed = ET.Element('feed', xmlns=ATOM_NS)
+    ET.SubElement(feed, 'title').text = title
+    ET.SubElement(feed, 'id').text = site_url + '/'
+    ET.SubElement(feed, 'link', href=site_url + '/')
+    ET.SubElement(feed, 'link', rel='self', href=site_url + '/feed.atom')
+    updated = entries[0]['updated'] if entries else datetime.now(timezone.utc)
+    ET.SubElement(feed, 'updated').text = updated.isoformat()
+    ET.SubElement(ET.SubElement(feed, 'author'), 'name').text = title
+    for e in entries:
+        entry = ET.SubElement(feed, 'entry')
+        ET.SubElement(entry, 'title').text = e['title']
+        ET.SubElement(entry, 'id').text = e['id']
+        ET.SubElement(entry, 'link', href=e['link'])
+        ET.SubElement(entry, 'updated').text = e['updated'].isoformat()
+        ET.SubElement(entry, 'summary').text = e['summary']
+    return ET.tostring(feed, encoding='utf-8', xml_declaration=True)
+
+
+def write_feed_file(feeds_dir, name, body):
+    """Write `name` and a gzipped copy, skipping the write if nothing changed."""
+    path = os.path.join(feeds_dir, name)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == body:
+                return False
+
+    # Plain file last: it is what the unchanged check compares against
+    for target, data in ((path + '.gz', gzip.compress(body, mtime=0)), (path, body)):
+        tmp_path = target + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+    return True
+
+
+def load_feed_file(feeds_dir, name):
+    """Read a generated file and its gzipped copy into a cache entry."""
+    path = os.path.join(feeds_dir, name)
+    with open(path, 'rb') as f:
+        body = f.read()
+    with open(path + '.gz', 'rb') as f:
+        compressed = f.read()
+    return {
+        'body': body,
+        'gzip': compressed,
+        'etag': hashlib.sha1(body).hexdigest(),
+        'modified': datetime.fromtimestamp(os.path.getmtime(path), timezone.utc),
+        'mimetype': FEED_FILES[name]
+    }